@@ -1,9 +1,12 @@
 import sys
 import os
 import json
+import functools
+import logging
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
-from PySide6.QtCore import Qt
+from PySide6.QtCore import Qt, QObject, QRunnable, QThreadPool, Signal
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QFormLayout, QLabel, QSpinBox, QPushButton, QTableWidget,
@@ -12,57 +15,166 @@ from PySide6.QtWidgets import (
 
 from .widgets.names_panel import NamesPanel
 from .models.participants import collect_participants_or_raise
-from .services.draw import find_secret_santa_assignment
+from .services.draw import build_candidates, find_secret_santa_assignment
 from .services.emailer import load_smtp_settings_from_env, send_secret_santa_emails, SMTPSettings
 from dotenv import load_dotenv
 
+log = logging.getLogger(__name__)
+
+@functools.lru_cache(maxsize=1)
 def _is_super_secret_mode() -> bool:
+    # Cached: .env is parsed exactly once per process, no matter how often
+    # the mode is checked.
     load_dotenv()
-    print("Checking for super secret mode...")
-    result = os.getenv("SuperSecret", "").lower() in {"true", "1", "yes"}
-    print("Super secret mode is active." if result else "Super secret mode is not active.")
-    return result
+    return os.getenv("SuperSecret", "").lower() in {"true", "1", "yes"}
 
-# Persistent history utilities
+# Persistent history utilities. The directory is created lazily on the
+# first draw so startup does not pay for it.
 HISTORY_DIR = Path(__file__).resolve().parent.parent / "output"
-HISTORY_DIR.mkdir(exist_ok=True)
 
-HISTORY_INDEX_FILE = HISTORY_DIR / "history_index.json"
+HISTORY_INDEX_FILE = HISTORY_DIR / "history_index.json"  # legacy format, read-only
+HISTORY_LOG_FILE = HISTORY_DIR / "history.jsonl"
+
+try:
+    # Optional: C-extension JSON, noticeably faster on large histories.
+    import orjson
+
+    def _loads(data):
+        return orjson.loads(data)
+
+    def _dumps_line(obj) -> str:
+        return orjson.dumps(obj).decode("utf-8")
+except ImportError:
+    _loads = json.loads
+
+    def _dumps_line(obj) -> str:
+        # Compact separators to match orjson's output byte-for-byte.
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+# (file mtimes, parsed pairs) — skip re-parsing when the files are unchanged.
+# Pairs are stored as giver -> set of past receivers, matching the draw service.
+_PAIRS_CACHE: tuple[tuple[float | None, float | None], dict[str, set[str]]] | None = None
 
 
-def _load_history_pairs() -> set[tuple[str, str]]:
-    pairs: set[tuple[str, str]] = set()
+def _history_mtimes() -> tuple[float | None, float | None]:
+    def mtime(path: Path) -> float | None:
+        try:
+            return path.stat().st_mtime
+        except OSError:
+            return None
+    return mtime(HISTORY_INDEX_FILE), mtime(HISTORY_LOG_FILE)
+
+
+def _load_history_pairs() -> dict[str, set[str]]:
+    global _PAIRS_CACHE
+    mtimes = _history_mtimes()
+    if _PAIRS_CACHE is not None and _PAIRS_CACHE[0] == mtimes:
+        return _PAIRS_CACHE[1]
+    # defaultdict keeps the build a single C-level __getitem__ per pair
+    # instead of a setdefault method call with a throwaway empty set.
+    pairs: dict[str, set[str]] = defaultdict(set)
+    # Legacy single-document index written by older versions.
     if HISTORY_INDEX_FILE.exists():
         try:
-            data = json.loads(HISTORY_INDEX_FILE.read_text(encoding="utf-8"))
-            for rec in data.get("assignments", []):
-                for giver, receiver in rec.get("pairs", []):
-                    pairs.add((giver, receiver))
+            # json/orjson decode UTF-8 in C; no intermediate Python str needed.
+            data = _loads(HISTORY_INDEX_FILE.read_bytes())
+            for rec in data.get("assignments", ()):
+                for giver, receiver in rec.get("pairs", ()):
+                    pairs[sys.intern(giver)].add(sys.intern(receiver))
         except Exception as e:
-            print(f"Failed to parse history index: {e}")
+            log.warning("Failed to parse history index: %s", e)
+    if HISTORY_LOG_FILE.exists():
+        try:
+            with HISTORY_LOG_FILE.open("rb") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        rec = _loads(line)
+                    except ValueError as e:
+                        # e.g. a torn trailing line from an interrupted append;
+                        # keep the records that did land.
+                        log.warning("Skipping bad history log line: %s", e)
+                        continue
+                    for giver, receiver in rec.get("pairs", ()):
+                        pairs[sys.intern(giver)].add(sys.intern(receiver))
+        except OSError as e:
+            log.warning("Failed to read history log: %s", e)
+    _PAIRS_CACHE = (mtimes, pairs)
     return pairs
 
 
+def _mark_pairs_cache_current(pairs: dict[str, set[str]]) -> None:
+    """Record that `pairs` already reflects what is on disk (write-through),
+    so the next _load_history_pairs is a cache hit instead of a re-parse."""
+    global _PAIRS_CACHE
+    _PAIRS_CACHE = (_history_mtimes(), pairs)
+
+
 def _append_history(assignment: dict[str, str]):
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    # Write detailed file
-    detail_path = HISTORY_DIR / f"{timestamp}.secret"
-    lines = ["# Secret Santa assignment", f"# Generated: {timestamp}", ""]
-    for giver, receiver in assignment.items():
-        lines.append(f"{giver} -> {receiver}")
-    detail_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
-    # Update index
-    index = {"assignments": []}
-    if HISTORY_INDEX_FILE.exists():
+    if not _is_super_secret_mode():
+        # Write detailed file. Skipped in super secret mode: a human-readable
+        # dump would leak the assignment the organizer asked not to see, and
+        # it halves the disk writes per draw.
+        detail_path = HISTORY_DIR / f"{timestamp}.secret"
+        lines = ["# Secret Santa assignment", f"# Generated: {timestamp}", ""]
+        for giver, receiver in assignment.items():
+            lines.append(f"{giver} -> {receiver}")
+        detail_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    # Append one record to the log: O(1) per draw, no read-modify-write.
+    record = {"timestamp": timestamp, "pairs": list(assignment.items())}
+    with HISTORY_LOG_FILE.open("a", encoding="utf-8") as f:
+        f.write(_dumps_line(record) + "\n")
+
+
+class _DrawSignals(QObject):
+    finished = Signal(object)  # dict[str, str] | None
+
+
+class DrawWorker(QRunnable):
+    """Runs the assignment search off the GUI thread so the event loop keeps painting."""
+
+    def __init__(self, people, candidates):
+        super().__init__()
+        self.signals = _DrawSignals()
+        self._people = people
+        self._candidates = candidates
+
+    def run(self):
+        assignment = find_secret_santa_assignment(self._people, candidates=self._candidates)
+        self.signals.finished.emit(assignment)
+
+
+class _SendSignals(QObject):
+    progress = Signal(str, str)  # (giver, recipient email) after each send
+    finished = Signal(object, object)  # (attempted list | None, error message | None)
+
+
+class SendWorker(QRunnable):
+    """Sends the emails off the GUI thread; the emailer itself reuses one
+    SMTP connection and recycles it per its message budget."""
+
+    def __init__(self, assignment, emails, settings):
+        super().__init__()
+        self.signals = _SendSignals()
+        self._assignment = assignment
+        self._emails = emails
+        self._settings = settings
+
+    def run(self):
         try:
-            index = json.loads(HISTORY_INDEX_FILE.read_text(encoding="utf-8")) or index
+            sent = send_secret_santa_emails(
+                assignment=self._assignment,
+                emails=self._emails,
+                settings=self._settings,
+                dry_run=False,
+                progress=self.signals.progress.emit
+            )
         except Exception as e:
-            print(f"Failed to read existing index: {e}")
-    index.setdefault("assignments", []).append({
-        "timestamp": timestamp,
-        "pairs": list(assignment.items())
-    })
-    HISTORY_INDEX_FILE.write_text(json.dumps(index, indent=2, ensure_ascii=False), encoding="utf-8")
+            self.signals.finished.emit(None, str(e))
+        else:
+            self.signals.finished.emit(sent, None)
 
 
 class MainWindow(QMainWindow):
@@ -107,10 +219,15 @@ class MainWindow(QMainWindow):
 
         self.results_table = QTableWidget(0, 2)
         self.results_table.setHorizontalHeaderLabels(["Giver", "Receiver"])
+        # Fixed width for the giver column; the receiver column stretches.
+        # Avoids the O(rows) text-measurement pass of resizeColumnsToContents.
+        self.results_table.setColumnWidth(0, 240)
         self.results_table.horizontalHeader().setStretchLastSection(True)
         self.results_table.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        # Determined once per process; the click handlers read this flag.
+        self._secret_mode = _is_super_secret_mode()
         # Hide the table entirely in super secret mode
-        if _is_super_secret_mode():
+        if self._secret_mode:
             self.results_table.hide()
 
         # ===== Layout =====
@@ -128,11 +245,19 @@ class MainWindow(QMainWindow):
         root.addWidget(actions)
         root.addWidget(self.results_table, stretch=2)
         self.setCentralWidget(central)
+        # Validation feedback goes here: unlike a modal QMessageBox it does
+        # not spin a nested event loop.
+        self.statusBar()
 
         # State
         self._last_assignment = None  # type: dict[str, str] | None
         self._last_emails = None      # type: dict[str, str] | None
-        self._history_pairs = _load_history_pairs()
+        self._history_pairs = None    # loaded lazily on first draw
+        self._draw_worker = None
+        self._send_worker = None
+        self._pending_people = None
+        self._pending_emails = None
+        self._pending_secret_mode = False
 
     # ---- Slots ----
     def _on_build_list(self):
@@ -140,7 +265,7 @@ class MainWindow(QMainWindow):
         singles = self.singles_spin.value()
         total = 2 * couples + singles
         if total < 2:
-            QMessageBox.warning(self, "Not enough people", "You need at least 2 people.")
+            self.statusBar().showMessage("Not enough people: you need at least 2.", 5000)
             self.secret_btn.setEnabled(False)
             self.send_btn.setEnabled(False)
             return
@@ -159,10 +284,17 @@ class MainWindow(QMainWindow):
                 single_rows=self.names_panel.single_rows
             )
         except ValueError as e:
-            QMessageBox.warning(self, "Invalid input", str(e))
+            self.statusBar().showMessage(f"Invalid input: {e}", 5000)
             return
+        # Intern names so the draw's dict/set probes share one canonical
+        # string object per name: identity-first comparison, cached hashes.
+        people = [sys.intern(p) for p in people]
+        partner_of = {
+            sys.intern(k): sys.intern(v) if v else v
+            for k, v in partner_of.items()
+        }
         emails_enabled = len(emails) > 0
-        secret_mode = _is_super_secret_mode()
+        secret_mode = self._secret_mode
         if secret_mode and not emails_enabled:
             # Secret mode cannot function without emails; fall back to normal mode.
             QMessageBox.information(
@@ -173,7 +305,35 @@ class MainWindow(QMainWindow):
             secret_mode = False
             if self.results_table.isHidden():
                 self.results_table.show()
-        assignment = find_secret_santa_assignment(people, partner_of, forbidden_pairs=self._history_pairs)
+        if self._history_pairs is None:
+            HISTORY_DIR.mkdir(exist_ok=True)
+            self._history_pairs = _load_history_pairs()
+        # Run the (potentially backtracking) search on a worker thread; the
+        # result is marshalled back to the GUI thread via a queued signal.
+        self._pending_people = people
+        self._pending_emails = emails if emails_enabled else None
+        self._pending_secret_mode = secret_mode
+        # build_btn too: rebuilding the rows mid-draw would swap out the
+        # pending people under the in-flight worker's feet.
+        self.build_btn.setEnabled(False)
+        self.secret_btn.setEnabled(False)
+        self.send_btn.setEnabled(False)
+        # Materialize the feasibility structure once on the GUI thread; the
+        # worker only consumes it, so no shared mutable state crosses threads.
+        candidates = build_candidates(people, partner_of, self._history_pairs)
+        worker = DrawWorker(people, candidates)
+        worker.signals.finished.connect(self._on_draw_finished, Qt.QueuedConnection)
+        self._draw_worker = worker  # keep alive while the pool runs it
+        QThreadPool.globalInstance().start(worker)
+
+    def _on_draw_finished(self, assignment):
+        self._draw_worker = None
+        self.build_btn.setEnabled(True)
+        self.secret_btn.setEnabled(True)
+        people = self._pending_people
+        emails = self._pending_emails
+        secret_mode = self._pending_secret_mode
+        emails_enabled = emails is not None
         if assignment is None:
             QMessageBox.critical(
                 self,
@@ -185,10 +345,13 @@ class MainWindow(QMainWindow):
             self.send_btn.setEnabled(False)
             return
         self._last_assignment = assignment
-        self._last_emails = emails if emails_enabled else None
+        self._last_emails = emails
         _append_history(assignment)
-        for pair in assignment.items():
-            self._history_pairs.add(pair)
+        for giver, receiver in assignment.items():
+            self._history_pairs.setdefault(sys.intern(giver), set()).add(sys.intern(receiver))
+        # Write-through: the in-memory pairs now match what was just appended,
+        # so re-key the cache and spare the next load a re-parse.
+        _mark_pairs_cache_current(self._history_pairs)
         if secret_mode:
             QMessageBox.information(
                 self,
@@ -198,12 +361,17 @@ class MainWindow(QMainWindow):
             self.results_table.setRowCount(0)
             self.send_btn.setEnabled(True)  # emails_enabled must be True here
         else:
-            self.results_table.setRowCount(len(assignment))
-            for row, giver in enumerate(people):
-                self.results_table.setItem(row, 0, QTableWidgetItem(giver))
-                self.results_table.setItem(row, 1, QTableWidgetItem(assignment[giver]))
-            self.results_table.resizeColumnsToContents()
-            self.results_table.horizontalHeader().setStretchLastSection(True)
+            # Batch the fill: one relayout/repaint instead of one per setItem.
+            self.results_table.setUpdatesEnabled(False)
+            self.results_table.blockSignals(True)
+            try:
+                self.results_table.setRowCount(len(assignment))
+                for row, giver in enumerate(people):
+                    self.results_table.setItem(row, 0, QTableWidgetItem(giver))
+                    self.results_table.setItem(row, 1, QTableWidgetItem(assignment[giver]))
+            finally:
+                self.results_table.blockSignals(False)
+                self.results_table.setUpdatesEnabled(True)
             self.send_btn.setEnabled(emails_enabled)
 
     def _on_send_emails(self):
@@ -217,17 +385,22 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "SMTP-configuratiefout", str(e))
             return
 
-        try:
-            sent = send_secret_santa_emails(
-                assignment=self._last_assignment,
-                emails=self._last_emails,
-                settings=settings,
-                dry_run=False
-            )
-        except Exception as e:
-            QMessageBox.critical(self, "Sending failed", f"Error during sending: {e}")
-            return
+        self.send_btn.setEnabled(False)
+        worker = SendWorker(self._last_assignment, self._last_emails, settings)
+        worker.signals.progress.connect(self._on_send_progress, Qt.QueuedConnection)
+        worker.signals.finished.connect(self._on_send_finished, Qt.QueuedConnection)
+        self._send_worker = worker  # keep alive while the pool runs it
+        QThreadPool.globalInstance().start(worker)
 
+    def _on_send_progress(self, giver, to_addr):
+        self.statusBar().showMessage(f"Sent email for {giver} to {to_addr}…", 2000)
+
+    def _on_send_finished(self, sent, error):
+        self._send_worker = None
+        self.send_btn.setEnabled(True)
+        if error is not None:
+            QMessageBox.critical(self, "Sending failed", f"Error during sending: {error}")
+            return
         QMessageBox.information(
             self,
             "Emails sent",
@@ -236,6 +409,7 @@ class MainWindow(QMainWindow):
 
 
 def run_app():
+    logging.basicConfig(level=logging.WARNING)
     app = QApplication(sys.argv)
     win = MainWindow()
     win.show()
@@ -2,14 +2,9 @@ import re
 from typing import Dict, List, Optional, Tuple
 from PySide6.QtWidgets import QLineEdit
 
-# Simple, pragmatic email pattern (not perfect RFC5322)
-EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
-
-
-def _read_pair(edits: Tuple[QLineEdit, QLineEdit]) -> Tuple[str, str]:
-    name = edits[0].text().strip()
-    email = edits[1].text().strip()
-    return name, email
+# Simple, pragmatic email pattern (not perfect RFC5322); used with
+# fullmatch, so no anchors needed.
+EMAIL_RE = re.compile(r"[^@\s]+@[^@\s]+\.[^@\s]+")
 
 
 def collect_participants_or_raise(
@@ -30,6 +25,7 @@ def collect_participants_or_raise(
     people: List[str] = []
     partner_of: Dict[str, Optional[str]] = {}
     emails: Dict[str, str] = {}
+    seen: set = set()
 
     # First pass: detect if any email was entered at all
     any_email_entered = False
@@ -49,16 +45,20 @@ def collect_participants_or_raise(
     # Couples
     for pair in couple_rows:
         (a_name_e, a_email_e), (b_name_e, b_email_e) = pair
-        a_name, a_email = _read_pair((a_name_e, a_email_e))
-        b_name, b_email = _read_pair((b_name_e, b_email_e))
+        a_name = a_name_e.text().strip()
+        a_email = a_email_e.text().strip()
+        b_name = b_name_e.text().strip()
+        b_email = b_email_e.text().strip()
 
         if not a_name or not b_name:
             raise ValueError("Complete all names of couples (no empty fields).")
-        if a_name == b_name:
-            raise ValueError("Names should be unique.")
+        if a_name == b_name or a_name in seen or b_name in seen:
+            raise ValueError("Each name must be unique (duplicates found).")
+        seen.add(a_name)
+        seen.add(b_name)
 
         if any_email_entered:
-            if not (a_email and EMAIL_RE.match(a_email)) or not (b_email and EMAIL_RE.match(b_email)):
+            if not (a_email and EMAIL_RE.fullmatch(a_email)) or not (b_email and EMAIL_RE.fullmatch(b_email)):
                 raise ValueError("Use valid email addresses for each couple (or leave all fields blank to proceed without email).")
             emails[a_name] = a_email
             emails[b_name] = b_email
@@ -69,19 +69,20 @@ def collect_participants_or_raise(
 
     # Singles
     for s_name_e, s_email_e in single_rows:
-        s_name, s_email = _read_pair((s_name_e, s_email_e))
+        s_name = s_name_e.text().strip()
+        s_email = s_email_e.text().strip()
         if not s_name:
             raise ValueError("Complete all names of singles (no empty fields).")
+        if s_name in seen:
+            raise ValueError("Each name must be unique (duplicates found).")
+        seen.add(s_name)
         if any_email_entered:
-            if not (s_email and EMAIL_RE.match(s_email)):
+            if not (s_email and EMAIL_RE.fullmatch(s_email)):
                 raise ValueError(f"Use a valid email address for single “{s_name or '—'}” (or leave all emails blank).")
             emails[s_name] = s_email
         people.append(s_name)
         partner_of[s_name] = None
 
-    # Duplicates & count
-    if len(set(people)) != len(people):
-        raise ValueError("Each name must be unique (duplicates found).")
     if len(people) < 2:
         raise ValueError("At least 2 people are required.")
 
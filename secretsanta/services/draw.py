@@ -1,62 +1,153 @@
 import random
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, List, Optional, Set
 
+# Shared empty receiver set so lookups for unknown givers allocate nothing.
+_NO_RECEIVERS: frozenset = frozenset()
 
-def find_secret_santa_assignment(
+
+def build_candidates(
     people: List[str],
     partner_of: Dict[str, Optional[str]],
-    max_tries: int = 200,
-    forbidden_pairs: Optional[Set[Tuple[str, str]]] = None,
+    forbidden_pairs: Optional[Dict[str, Set[str]]] = None,
+) -> Dict[str, List[str]]:
+    """
+    Precompute each giver's allowed receivers: everyone except themselves,
+    their partner (if any) and receivers in forbidden_pairs[giver].
+    """
+    forbidden_pairs = forbidden_pairs or {}
+    candidates: Dict[str, List[str]] = {}
+    for g in people:
+        partner = partner_of.get(g)
+        banned = forbidden_pairs.get(g, _NO_RECEIVERS)
+        candidates[g] = [
+            p for p in people
+            if p != g and p != partner and p not in banned
+        ]
+    return candidates
+
+
+def _random_derangement(people: List[str]) -> Dict[str, str]:
+    """
+    Sattolo's algorithm: a uniformly random single cycle over the indices,
+    hence a derangement, in guaranteed O(n) with no search at all.
+    """
+    idx = list(range(len(people)))
+    for i in range(len(idx) - 1, 0, -1):
+        j = random.randrange(i)
+        idx[i], idx[j] = idx[j], idx[i]
+    return {people[i]: people[idx[i]] for i in range(len(people))}
+
+
+def find_secret_santa_assignment(
+    people: List[str],
+    partner_of: Optional[Dict[str, Optional[str]]] = None,
+    forbidden_pairs: Optional[Dict[str, Set[str]]] = None,
+    candidates: Optional[Dict[str, List[str]]] = None,
 ) -> Optional[Dict[str, str]]:
     """
-    Backtracking with light randomization.
+    Bipartite maximum matching (augmenting paths) between givers and receivers.
     Constraints:
       - No self-assignments.
       - No giving to your partner (if any).
-      - No (giver, receiver) in forbidden_pairs (historical assignments) if provided.
-    Returns mapping giver -> receiver, or None if impossible.
+      - No receiver in forbidden_pairs[giver] (historical assignments) if provided.
+    Callers that already hold a precomputed feasibility structure can pass it
+    as `candidates` (see build_candidates); partner_of/forbidden_pairs are
+    then ignored. Returns mapping giver -> receiver, or None if no perfect
+    matching exists.
 
-    Quick impossibility: exactly two people who are a couple.
+    Candidate lists are shuffled per call so repeated draws stay randomized;
+    the search itself is polynomial instead of retried exponential backtracking.
     """
     n = len(people)
-    if n == 2:
-        a, b = people
-        if partner_of.get(a) == b and partner_of.get(b) == a:
-            return None
+    # Common case: no couples and no history. Any derangement works, so a
+    # single Sattolo pass beats running the matching machinery.
+    if n >= 2:
+        if candidates is None:
+            unconstrained = not forbidden_pairs and (
+                partner_of is None
+                or all(partner_of.get(p) is None for p in people)
+            )
+        else:
+            # Candidate lists of length n-1 mean only the giver themselves
+            # is excluded for everyone.
+            unconstrained = all(len(candidates.get(g, ())) == n - 1 for g in people)
+        if unconstrained:
+            return _random_derangement(people)
 
-    base_candidates: Dict[str, List[str]] = {}
-    for g in people:
-        forbidden = {g}
-        if partner_of.get(g):
-            forbidden.add(partner_of[g])
-        base_candidates[g] = [p for p in people if p not in forbidden]
-
-    for _ in range(max_tries):
-        receivers_available = set(people)
-        assignment: Dict[str, str] = {}
+    # Encode receivers as bit positions: candidate filtering and the visited
+    # set become single AND/OR operations on machine ints instead of Python
+    # loops over name lists. Receivers are numbered in a fresh random order
+    # per call, so iterating set bits low-to-high keeps draws randomized.
+    receivers = list(people)
+    random.shuffle(receivers)
+    bit_of = {name: j for j, name in enumerate(receivers)}
+    masks: Dict[str, int] = {}
+    if candidates is None:
+        # Build each mask directly: start from all-ones and clear the self,
+        # partner and forbidden bits — no intermediate name lists.
+        partner_of = partner_of or {}
+        forbidden_pairs = forbidden_pairs or {}
+        full = (1 << n) - 1
+        for g in people:
+            mask = full & ~(1 << bit_of[g])
+            partner = partner_of.get(g)
+            if partner is not None:
+                mask &= ~(1 << bit_of[partner])
+            for r in forbidden_pairs.get(g, _NO_RECEIVERS):
+                if r in bit_of:
+                    mask &= ~(1 << bit_of[r])
+            if not mask:
+                return None
+            masks[g] = mask
+    else:
+        for g in people:
+            mask = 0
+            for r in candidates.get(g, ()):
+                mask |= 1 << bit_of[r]
+            if not mask:
+                return None
+            masks[g] = mask
 
-        # Heuristic: sort by fewest options first, then lightly shuffle head
-        order = sorted(people, key=lambda x: len(base_candidates[x]))
-        random.shuffle(order[:max(1, len(order)//3)])
+    match_of_bit: List[Optional[str]] = [None] * n
+    visited = 0  # bitset of receivers seen in the current augmentation
 
-        def backtrack(i: int) -> bool:
-            if i == len(order):
+    def augment(start: str) -> bool:
+        # Explicit stack instead of recursion: no Python call frame per
+        # depth. givers/todos are the DFS frames; chosen[i] is the bit
+        # givers[i] is currently trying.
+        nonlocal visited
+        givers = [start]
+        todos = [masks[start]]
+        chosen: List[int] = []
+        while givers:
+            todo = todos[-1] & ~visited
+            if not todo:
+                givers.pop()
+                todos.pop()
+                if chosen:
+                    chosen.pop()
+                continue
+            bit = todo & -todo
+            visited |= bit
+            todos[-1] = todo
+            chosen.append(bit)
+            holder = match_of_bit[bit.bit_length() - 1]
+            if holder is None:
+                # Free receiver found: flip the whole alternating path.
+                for giver, taken in zip(givers, chosen):
+                    match_of_bit[taken.bit_length() - 1] = giver
                 return True
-            giver = order[i]
-            candidates = [r for r in base_candidates[giver] if r in receivers_available]
-            random.shuffle(candidates)
-            for r in candidates:
-                if forbidden_pairs and (giver, r) in forbidden_pairs:
-                    continue
-                assignment[giver] = r
-                receivers_available.remove(r)
-                if backtrack(i + 1):
-                    return True
-                receivers_available.add(r)
-                del assignment[giver]
-            return False
-
-        if backtrack(0):
-            return assignment
-
-    return None
+            givers.append(holder)
+            todos.append(masks[holder])
+        return False
+
+    # Match givers with the fewest options first (MRV heuristic).
+    for g in sorted(people, key=lambda x: masks[x].bit_count()):
+        visited = 0
+        if not augment(g):
+            return None
+    return {
+        giver: receivers[j]
+        for j, giver in enumerate(match_of_bit)
+        if giver is not None
+    }
@@ -1,14 +1,21 @@
+from __future__ import annotations
+
 import os
-import ssl
-import smtplib
+import atexit
+import functools
 from dataclasses import dataclass
 from email.message import EmailMessage
-from typing import Dict, List, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
 
-from dotenv import load_dotenv
+# smtplib, ssl and dotenv are deliberately imported inside the functions
+# that need them: none are required to show the GUI, and deferring them
+# shaves their parse cost off application startup.
+if TYPE_CHECKING:
+    import smtplib
+    import ssl
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SMTPSettings:
     host: str
     port: int
@@ -18,7 +25,12 @@ class SMTPSettings:
     sender_name: str | None = None
 
 
+@functools.lru_cache(maxsize=1)
 def load_smtp_settings_from_env() -> SMTPSettings:
+    # Cached: .env is read and validated once per process; call
+    # load_smtp_settings_from_env.cache_clear() to force a re-read.
+    from dotenv import load_dotenv
+
     load_dotenv()  # loads .env into process env; no-op if already loaded
 
     host = os.getenv("SMTP_HOST", "")
@@ -45,48 +57,117 @@ def _format_sender(settings: SMTPSettings) -> str:
     return f"{settings.sender_name} <{settings.sender}>" if settings.sender_name else settings.sender
 
 
+# Providers recommend recycling bulk-send sessions every ~100 messages.
+_MAX_MESSAGES_PER_CONNECTION = 100
+
+# Rendered once per giver; keep the {giver} and {recipient} placeholders
+# when customizing the text.
+BODY_TEMPLATE = (
+    "Hey {giver},\n\n"
+    "Santa told me that you get to choose something nice for {recipient} this year!\n\n"
+    "Be original and keep it a secret! \U0001F609\n\n"
+    "Best regards,\n"
+    "The Super Secret Santa Elves Committee"
+)
+
+
+# One pooled connection kept alive between send batches, so repeat sends
+# skip the TLS handshake and AUTH round trips.
+_pool: "smtplib.SMTP_SSL | None" = None
+
+
+def _discard_pool() -> None:
+    import smtplib
+
+    global _pool
+    if _pool is not None:
+        try:
+            _pool.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+        _pool = None
+
+
+atexit.register(_discard_pool)
+
+
+def _get_server(settings: SMTPSettings, context: ssl.SSLContext) -> smtplib.SMTP_SSL:
+    """Return a live pooled connection: probe an existing one with NOOP,
+    reconnect (and log in again) if it has gone stale."""
+    import smtplib
+
+    global _pool
+    if _pool is not None:
+        try:
+            if _pool.noop()[0] == 250:
+                return _pool
+        except (smtplib.SMTPException, OSError):
+            pass
+        _discard_pool()
+    server = smtplib.SMTP_SSL(settings.host, settings.port, context=context)
+    server.login(settings.username, settings.password)
+    _pool = server
+    return server
+
+
 def send_secret_santa_emails(
     assignment: Dict[str, str],
     emails: Dict[str, str],
     settings: SMTPSettings,
-    dry_run: bool = False
+    dry_run: bool = False,
+    progress: Optional[Callable[[str, str], None]] = None
 ) -> List[Tuple[str, str]]:
     """
     Sends one email per giver with the receiver's name in the body.
     Returns a list of (giver, recipient_email) that were attempted/sent.
+    If given, `progress` is called with (giver, recipient_email) after
+    each successful send.
     """
-    attempted: List[Tuple[str, str]] = []
-
-    # Build messages first to fail fast on missing emails
-    messages: List[EmailMessage] = []
-    for giver, receiver in assignment.items():
-        if giver not in emails:
-            raise ValueError(f"No email address found for '{giver}'.")
-        to_addr = emails[giver]
-
-        msg = EmailMessage()
-        msg["Subject"] = "Secret Santa"
-        msg["From"] = _format_sender(settings)
-        msg["To"] = to_addr
-
-        body = (
-            f"Hey {giver.capitalize()},\n\n"
-            f"Santa told me that you get to choose something nice for {receiver.capitalize()} this year!\n\n"
-            "Be original and keep it a secret! 😉\n\n"
-            "Best regards,\n"
-            "The Super Secret Santa Elves Committee"
-        )
-        msg.set_content(body)
-        messages.append(msg)
-        attempted.append((giver, to_addr))
+    # Fail fast on missing emails before any message or network work; one
+    # set difference reports every missing giver at once.
+    missing = assignment.keys() - emails.keys()
+    if missing:
+        raise ValueError(f"No email address found for: {', '.join(sorted(missing))}.")
+    attempted: List[Tuple[str, str]] = [(giver, emails[giver]) for giver in assignment]
 
     if dry_run:
         return attempted
 
+    import smtplib
+    import ssl
+
+    from_header = _format_sender(settings)  # invariant across the loop
     context = ssl.create_default_context()
-    with smtplib.SMTP_SSL(settings.host, settings.port, context=context) as server:
-        server.login(settings.username, settings.password)
-        for msg in messages:
-            server.send_message(msg)
+    server = _get_server(settings, context)
+    # Compose inside the session: the first send starts immediately and
+    # only one message is alive at a time. The connection is left open for
+    # the next batch; atexit closes it on shutdown.
+    for sent, (giver, receiver) in enumerate(assignment.items()):
+        if sent and sent % _MAX_MESSAGES_PER_CONNECTION == 0:
+            _discard_pool()
+            server = _get_server(settings, context)
+
+        msg = EmailMessage()
+        msg["Subject"] = "Secret Santa"
+        msg["From"] = from_header
+        to_addr = emails[giver]
+        msg["To"] = to_addr
+        msg.set_content(BODY_TEMPLATE.format(
+            giver=giver.capitalize(), recipient=receiver.capitalize()
+        ))
+        # Flatten to bytes once and pass the envelope explicitly: sendmail
+        # skips send_message's header re-scan and never re-renders the MIME
+        # tree, even on the retry path. sendmail does not fix line endings
+        # on bytes payloads, so flatten with CRLF ourselves (RFC 5321).
+        payload = msg.as_bytes(policy=msg.policy.clone(linesep="\r\n"))
+        try:
+            server.sendmail(settings.sender, [to_addr], payload)
+        except smtplib.SMTPServerDisconnected:
+            # Stale socket: reconnect once and retry this message.
+            _discard_pool()
+            server = _get_server(settings, context)
+            server.sendmail(settings.sender, [to_addr], payload)
+        if progress is not None:
+            progress(giver, to_addr)
 
     return attempted
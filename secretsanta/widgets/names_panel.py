@@ -1,9 +1,12 @@
 from typing import List, Tuple
 from PySide6.QtCore import Qt
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QGroupBox, QHBoxLayout, QLineEdit, QScrollArea, QLabel, QGridLayout
+    QWidget, QVBoxLayout, QGroupBox, QLineEdit, QScrollArea, QLabel, QGridLayout
 )
 
+# One pooled person row: (name label, name edit, email label, email edit).
+_PersonRow = Tuple[QLabel, QLineEdit, QLabel, QLineEdit]
+
 
 class NamesPanel(QWidget):
     """
@@ -12,6 +15,10 @@ class NamesPanel(QWidget):
       - email (QLineEdit)
     Couples are shown as two person-rows inside a "Couples" group.
     Singles are shown inside "Singles".
+    Each group is a single QGridLayout (one row per person) rather than a
+    wrapper widget per person, keeping the widget count low. Rows are pooled:
+    changing the counts only creates/hides the delta and in-progress text is
+    preserved.
     Exposes:
       - couple_rows: List[List[Tuple[name_edit, email_edit]]]  (each inner list length=2)
       - single_rows: List[Tuple[name_edit, email_edit]]
@@ -28,55 +35,77 @@ class NamesPanel(QWidget):
         self.container_layout = QVBoxLayout(self.container)
         self.container_layout.setAlignment(Qt.AlignTop)
 
+        self.couples_group = QGroupBox("Couples")
+        self.couples_grid = QGridLayout(self.couples_group)
+        self.singles_group = QGroupBox("Singles")
+        self.singles_grid = QGridLayout(self.singles_group)
+        self.container_layout.addWidget(self.couples_group)
+        self.container_layout.addWidget(self.singles_group)
+
         self.scroll.setWidget(self.container)
         layout.addWidget(self.scroll)
 
+        self._couple_person_pool: List[_PersonRow] = []
+        self._single_pool: List[_PersonRow] = []
         self.couple_rows: List[List[Tuple[QLineEdit, QLineEdit]]] = []
         self.single_rows: List[Tuple[QLineEdit, QLineEdit]] = []
 
     def clear(self):
-        for i in reversed(range(self.container_layout.count())):
-            w = self.container_layout.itemAt(i).widget()
-            if w:
-                w.setParent(None)
+        """Hide all pooled rows; the widgets are kept for reuse by rebuild()."""
+        for person in self._couple_person_pool:
+            for w in person:
+                w.hide()
+        for person in self._single_pool:
+            for w in person:
+                w.hide()
         self.couple_rows.clear()
         self.single_rows.clear()
 
-    def _make_person_row(self, name_ph: str) -> Tuple[QLineEdit, QLineEdit, QWidget]:
-        wrap = QWidget()
-        g = QGridLayout(wrap)
-        g.setContentsMargins(0, 0, 0, 0)
+    def _add_person_row(self, grid: QGridLayout, row: int, name_ph: str) -> _PersonRow:
+        name_label = QLabel("Name")
         name = QLineEdit()
         name.setPlaceholderText(name_ph)
+        email_label = QLabel("Email")
         email = QLineEdit()
         email.setPlaceholderText("email@address.com")
-        g.addWidget(QLabel("Name"), 0, 0)
-        g.addWidget(name, 0, 1)
-        g.addWidget(QLabel("Email"), 1, 0)
-        g.addWidget(email, 1, 1)
-        return name, email, wrap
+        grid.addWidget(name_label, row, 0)
+        grid.addWidget(name, row, 1)
+        grid.addWidget(email_label, row, 2)
+        grid.addWidget(email, row, 3)
+        return name_label, name, email_label, email
 
-    def rebuild(self, couples: int, singles: int):
-        self.clear()
+    @staticmethod
+    def _set_visible(pool: List[_PersonRow], count: int):
+        for person in pool[:count]:
+            for w in person:
+                w.show()
+        for person in pool[count:]:
+            for w in person:
+                w.hide()
 
-        couples_group = QGroupBox("Couples")
-        couples_layout = QVBoxLayout(couples_group)
-        for i in range(1, couples + 1):
-            row = QWidget()
-            row_layout = QHBoxLayout(row)
-            a_name, a_email, a_widget = self._make_person_row(f"Couple {i} – Person A")
-            b_name, b_email, b_widget = self._make_person_row(f"Couple {i} – Person B")
-            row_layout.addWidget(a_widget)
-            row_layout.addWidget(b_widget)
-            couples_layout.addWidget(row)
-            self.couple_rows.append([(a_name, a_email), (b_name, b_email)])
+    def rebuild(self, couples: int, singles: int):
+        # Grow the pools only by the missing rows; row index -> label is
+        # stable, so placeholders are set once at creation.
+        pool = self._couple_person_pool
+        while len(pool) < 2 * couples:
+            row = len(pool)
+            person = "A" if row % 2 == 0 else "B"
+            pool.append(self._add_person_row(
+                self.couples_grid, row, f"Couple {row // 2 + 1} – Person {person}"
+            ))
+        while len(self._single_pool) < singles:
+            row = len(self._single_pool)
+            self._single_pool.append(
+                self._add_person_row(self.singles_grid, row, f"Single {row + 1}")
+            )
 
-        singles_group = QGroupBox("Singles")
-        singles_layout = QVBoxLayout(singles_group)
-        for i in range(1, singles + 1):
-            s_name, s_email, s_widget = self._make_person_row(f"Single {i}")
-            singles_layout.addWidget(s_widget)
-            self.single_rows.append((s_name, s_email))
+        self._set_visible(pool, 2 * couples)
+        self._set_visible(self._single_pool, singles)
 
-        self.container_layout.addWidget(couples_group)
-        self.container_layout.addWidget(singles_group)
+        self.couple_rows = [
+            [(pool[2 * i][1], pool[2 * i][3]), (pool[2 * i + 1][1], pool[2 * i + 1][3])]
+            for i in range(couples)
+        ]
+        self.single_rows = [
+            (person[1], person[3]) for person in self._single_pool[:singles]
+        ]